@@ -4,18 +4,22 @@
 Simple script to demo the API
 """
 
-import sys, json, pprint
-from drone_mobile import Vehicle
+import pprint
+import sys
 
 if __name__ == "__main__":
         if len(sys.argv) != 3:
                 raise Exception('You must specify Username and Password as arguments, e.g. demo.py test@test.com password123')
         else:
-                vehicleObject = Vehicle(sys.argv[1], sys.argv[2]) # Username, Password   
-                vehicleObject.auth()        
-                vehicles = vehicleObject.getAllVehicles()
+                # Imported here so a usage error doesn't pay for loading requests/urllib3/ssl
+                from drone_mobile import Vehicle
 
-                pprint.pprint(json.dumps(vehicles), compact=True)# Print the status of all vehicles
+                # Closing the Vehicle on exit releases the pooled session
+                with Vehicle(sys.argv[1], sys.argv[2]) as vehicleObject: # Username, Password
+                        vehicleObject.auth()
+                        # Use the vehicle list records as statuses so the demo makes a single API request
+                        statuses = vehicleObject.getAllVehicleStatuses(from_vehicle_list=True)
+                        pprint.pprint(statuses, compact=True)# Print the status of all vehicles
                 
                 # r.unlock() # Unlock the doors
 
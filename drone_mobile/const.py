@@ -1,5 +1,7 @@
 """Constants for the DroneMobile python library."""
 
+from types import MappingProxyType
+
 AWSCLIENTID = "3l3gtebtua7qft45b4splbeuiu"
 
 BASE_API_URL = "https://api.dronemobile.com/api/"
@@ -12,10 +14,11 @@ URLS = {
     "auth": "https://cognito-idp.us-east-1.amazonaws.com/",
     "user_info": f"{BASE_API_URL}{API_VERSION}/user",
     "vehicle_info": f"{BASE_API_URL}{API_VERSION}/vehicle?limit=100",
+    "vehicle": f"{BASE_API_URL}{API_VERSION}/vehicle/",
     "command": f"{BASE_API_URL}{API_VERSION}/iot/command",
 }
 
-AVAILABLE_COMMANDS = {
+AVAILABLE_COMMANDS = frozenset({
     "DEVICE_STATUS",
     "REMOTE_START",
     "REMOTE_STOP",
@@ -27,23 +30,56 @@ AVAILABLE_COMMANDS = {
     "REMOTE_AUX1",
     "REMOTE_AUX2",
     "LOCATION",
-}
+    "A30", # Sent by Vehicle.location()
+})
+
+AVAILABLE_COMMANDS_STR = ", ".join(sorted(AVAILABLE_COMMANDS))
 
 AVAILABLE_DEVICE_TYPES = {
     "1", # I think this is in reference to the vehicle
     "2", # I think this is in reference to the DroneMobile Contoller Module
 }
 
-COMMAND_HEADERS = {
+# Read-only so the shared defaults can't be mutated by one Vehicle and leak into another
+COMMAND_HEADERS = MappingProxyType({
     "Authorization": None,
     "Content-Type": "application/json",
-}
+})
 
-AUTH_HEADERS = {
+AUTH_HEADERS = MappingProxyType({
     "Referer": "https://accounts.dronemobile.com/",
     "X-Amz-Target": "AWSCognitoIdentityProviderService.InitiateAuth",
     "X-Amz-User-Agent": "aws-amplify/5.0.4 js",
     "Content-Type": "application/x-amz-json-1.1",
-}
+})
+
+TOKEN_FILE_LOCATION = "./drone_mobile_token.txt"
+
+# Refresh the token this many seconds before it expires, capped at a fraction of its lifetime
+# so short-lived tokens aren't treated as expired as soon as they're issued
+TOKEN_EXPIRY_MARGIN = 100
+TOKEN_EXPIRY_MARGIN_FRACTION = 0.25
+
+# Connection pool sizing for the shared requests.Session
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
+# (connect, read) timeouts in seconds for every request. Commands wait on the vehicle, so reads get longer.
+REQUEST_TIMEOUT = (5, 60)
+
+# Retries for rate-limited and gateway error responses; Retry-After is honored when present.
+# Commands (POST) are only retried on 429, since a gateway error may follow a command that already ran.
+MAX_RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+# Longest Retry-After wait honored, in seconds, so one throttled call can't stall a thread indefinitely
+RETRY_AFTER_MAX = 30
+
+# Seconds a fetched vehicle status is reused before vehicle_status() hits the API again
+STATUS_CACHE_TTL = 15
+
+# Seconds the vehicle list is reused before getAllVehicles() hits the API again
+VEHICLE_CACHE_TTL = 60
 
-TOKEN_FILE_LOCATION = "./drone_mobile_token.txt"
\ No newline at end of file
+# Seconds between keep-alive requests when Vehicle.startKeepAlive() is used
+KEEPALIVE_INTERVAL = 45
\ No newline at end of file
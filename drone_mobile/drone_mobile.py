@@ -1,51 +1,148 @@
 from .const import (
     URLS,
     AVAILABLE_COMMANDS,
+    AVAILABLE_COMMANDS_STR,
     COMMAND_HEADERS,
     AUTH_HEADERS,
     AWSCLIENTID,
     TOKEN_FILE_LOCATION,
-    HOST,
-    BASE_API_URL,
-    API_VERSION,
+    TOKEN_EXPIRY_MARGIN,
+    TOKEN_EXPIRY_MARGIN_FRACTION,
+    POOL_CONNECTIONS,
+    POOL_MAXSIZE,
+    REQUEST_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_STATUS_CODES,
+    RETRY_AFTER_MAX,
+    KEEPALIVE_INTERVAL,
+    STATUS_CACHE_TTL,
+    VEHICLE_CACHE_TTL,
 )
 
 import json
 import logging
 import os
+import tempfile
 import threading
 import filelock
 import time
 import calendar
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 _LOGGER = logging.getLogger(__name__)
+# Accept-Encoding is left to requests, which only advertises encodings urllib3 can decode
+# (br is included when brotli is installed)
 defaultHeaders = {
     "Accept": "*/*",
-    "Accept-Encoding": "gzip, deflate, br",
 }
 
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+class _CommandSafeRetry(Retry):
+    """Retry that only re-sends a POST when it was rate limited, and caps Retry-After waits"""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        # A gateway 5xx can arrive after the backend already ran the command, and a repeated
+        # start can turn the engine back off. A 429 means the request was never processed.
+        if method.upper() == "POST" and status_code != 429:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_retry_after(self, response):
+        retryAfter = super().get_retry_after(response)
+        if retryAfter is None:
+            return None
+        return min(retryAfter, RETRY_AFTER_MAX)
+
 class Vehicle(object):
     '''Represents a DroneMobile vehicle, with methods for status and issuing commands'''
 
-    def __init__(self, username, password):
+    def __init__(self, username, password, cache_ttl=STATUS_CACHE_TTL, vehicle_cache_ttl=VEHICLE_CACHE_TTL):
         self.username = username
         self.password = password
         self.accessToken = None
         self.accessTokenExpiresIn = None
         self.accessTokenExpiresAt = None
-        self.accessTokenExpiresAtDateTime = None
+        self._tokenDeadline = None
         self.idToken = None
         self.idTokenType = None
         self.refreshToken = None
+        self._commandHeaders = None
+        self._vehicles = {}
+        self._vehicleList = []
+        self._vehiclesFetchedAt = None
+        self._vehicleCacheTTL = vehicle_cache_ttl
+        self._statusCache = {}
+        self._statusCacheTTL = cache_ttl
+        self._statusGeneration = 0
+        self._inflight = {}
+        self._statusLock = threading.Lock()
+        self._tokenLock = threading.Lock()
+        self._fileLock = None
+        self._tokenDir = None
+        self._keepAliveStop = None
+        self._keepAliveThread = None
         self.token_location = TOKEN_FILE_LOCATION
+        # Share one pooled session so keep-alive connections are reused across calls
+        self._session = requests.Session()
+        self._session.headers.update(defaultHeaders)
+        # Back off and retry when rate limited or the gateway fails, on the pooled connection.
+        # Read errors are never retried and POSTs are only retried on 429, so a command that
+        # may have reached the server is never sent twice.
+        retries = _CommandSafeRetry(
+            total=MAX_RETRIES,
+            read=0,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retries))
     
+    @property
+    def accessTokenExpiresAtDateTime(self):
+        # Only needed for display, so convert on access rather than on every token update
+        if self.accessTokenExpiresAt is None:
+            return None
+        return time.localtime(self.accessTokenExpiresAt)
+
+    @accessTokenExpiresAtDateTime.setter
+    def accessTokenExpiresAtDateTime(self, value):
+        # Kept assignable for callers that set it directly; it is stored as the epoch timestamp.
+        # The getter returns local time, so undo the struct's own UTC offset; unlike mktime this
+        # is exact across DST changes. Structs built without an offset are read as local time.
+        if value is None:
+            self.accessTokenExpiresAt = None
+        elif value.tm_gmtoff is not None:
+            self.accessTokenExpiresAt = calendar.timegm(value) - value.tm_gmtoff
+        else:
+            self.accessTokenExpiresAt = time.mktime(value)
+
     def auth(self):
         _LOGGER.debug("Auth method called.")
         """Authenticate and store the token"""
 
-        json = {
+        body = _dumps({
             "AuthFlow": "USER_PASSWORD_AUTH",
             "ClientId": AWSCLIENTID,
             "AuthParameters": {
@@ -53,30 +150,25 @@ class Vehicle(object):
                 "PASSWORD": self.password,
             },
             "ClientMetadata": {},
-        }
-
-        headers = {
-            **defaultHeaders,
-            **AUTH_HEADERS,
-        }
+        })
 
-        response = requests.post(
+        response = self._session.post(
             URLS["auth"],
-            json=json,
-            headers=headers,
+            data=body,
+            headers=AUTH_HEADERS,
+            timeout=REQUEST_TIMEOUT,
         )
 
         if response.status_code == 200:
             _LOGGER.debug("Succesfully fetched token.")
-            result = response.json()
+            result = _loads(response.content)
             self.accessToken = result["AuthenticationResult"]["AccessToken"]
-            self.accessTokenExpiresAt = (time.time() - 100) + result["AuthenticationResult"]["ExpiresIn"]
-            self.accessTokenExpiresAtDateTime = time.localtime(self.accessTokenExpiresAt)
+            self.__setTokenExpiry(result["AuthenticationResult"]["ExpiresIn"])
             self.idToken = result["AuthenticationResult"]["IdToken"]
             self.idTokenType = result["AuthenticationResult"]["TokenType"]
+            self.__updateCommandHeaders()
             self.refreshToken = result["AuthenticationResult"]["RefreshToken"]
             result["expiry_time"] = self.accessTokenExpiresAt
-            result["expiry_date"] = time.localtime(self.accessTokenExpiresAt)
             self.writeToken(result)
             return True
         else:
@@ -84,36 +176,52 @@ class Vehicle(object):
     
     def __acquireToken(self):
         _LOGGER.debug("Acquire Token method called.")
+        # Fast path: a valid in-memory token needs no lock, file read or refresh
+        if self.__tokenIsValid():
+            return
+        with self._tokenLock:
+            # Another thread may have refreshed the token while we waited on the lock
+            if self.__tokenIsValid():
+                return
+            self.__loadOrRefreshToken()
+
+    def __tokenIsValid(self):
+        return self.idToken is not None and self._tokenDeadline is not None and time.monotonic() < self._tokenDeadline
+
+    def __loadOrRefreshToken(self):
+        if self.idToken is not None:
+            # The token file is only read once; after that the in-memory token is authoritative
+            _LOGGER.debug("Token has expired, requesting new token")
+            self.__refreshTokenLocked()
+            return
         # Fetch and refresh token as needed
+        if not os.path.isfile(self.token_location):
+            # No token in memory or on disk, so authenticate from scratch
+            _LOGGER.debug("No saved token, authenticating")
+            self.auth()
+            return
         # If file exists read in token file and check it's valid
-        if os.path.isfile(self.token_location):
-            data = self.readToken()
-        else:
-            data = dict()
-            data["AuthenticationResult"]["AccessToken"] = self.accessToken
-            data["expiry_time"] = self.accessTokenExpiresAt
-            data["expiry_date"] = self.accessTokenExpiresAtDateTime
-            data["AuthenticationResult"]["IdToken"] = self.idToken
-            data["AuthenticationResult"]["TokenType"] = self.idTokenType
-            data["AuthenticationResult"]["RefreshToken"] = self.refreshToken
+        data = self.readToken()
         self.accessToken = data["AuthenticationResult"]["AccessToken"]
         #Need to handle possible data transformation
         if "expiry_time" not in data:
-            if data["expiry_date"] is not None:
+            if data.get("expiry_date") is not None:
                 if isinstance(data["expiry_date"], float):
                     data["expiry_time"] = data["expiry_date"]
                     self.accessTokenExpiresAt = data["expiry_time"]
-                    self.accessTokenExpiresAtDateTime = time.localtime(self.accessTokenExpiresAt)
         else:
             self.accessTokenExpiresAt = data["expiry_time"]
-            self.accessTokenExpiresAtDateTime = time.localtime(self.accessTokenExpiresAt)
+        if self.accessTokenExpiresAt:
+            # Translate the saved wall-clock expiry to the monotonic clock once, at load time
+            self._tokenDeadline = time.monotonic() + (self.accessTokenExpiresAt - time.time())
         self.idToken = data["AuthenticationResult"]["IdToken"]
         self.idTokenType = data["AuthenticationResult"]["TokenType"]
+        self.__updateCommandHeaders()
         self.refreshToken = data["AuthenticationResult"]["RefreshToken"]
-        if self.accessTokenExpiresAt:
-            if time.time() >= self.accessTokenExpiresAt:
-                _LOGGER.debug("No token, or has expired, requesting new token")
-                self.__refreshToken()
+        # A saved token without an expiry can't be checked, so refresh it once; that records and saves one
+        if not self.accessTokenExpiresAt or time.time() >= self.accessTokenExpiresAt:
+            _LOGGER.debug("No token expiry, or has expired, requesting new token")
+            self.__refreshTokenLocked()
         if self.idToken == None:
             # No existing token exists so refreshing library
             self.auth()
@@ -121,40 +229,77 @@ class Vehicle(object):
             _LOGGER.debug("Token is valid, continuing")
             pass
 
+    def __refreshTokenLocked(self):
+        # Hold the token file lock while refreshing so other processes sharing the token file
+        # don't hit the refresh endpoint at the same time
+        lockLocation = f"{self.token_location}.lock"
+        # Reuse the lock object unless token_location has been changed since it was created
+        if self._fileLock is None or self._fileLock.lock_file != lockLocation:
+            self._fileLock = filelock.FileLock(lockLocation)
+        try:
+            self._fileLock.acquire(timeout=10)
+        except filelock.Timeout:
+            _LOGGER.debug("Another instance of this application currently holds the lock. Refreshing anyway.")
+            self.__refreshToken()
+            return
+        try:
+            # Another process may have refreshed while we waited on the lock; if so, use its token
+            if not self.__loadNewerSavedToken():
+                self.__refreshToken()
+        finally:
+            self._fileLock.release()
+
+    def __loadNewerSavedToken(self):
+        try:
+            data = self.readToken()
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or not isinstance(data.get("AuthenticationResult"), dict):
+            return False
+        result = data["AuthenticationResult"]
+        expiresAt = data.get("expiry_time")
+        if result.get("IdToken") in (None, self.idToken) or not isinstance(expiresAt, (int, float)) or time.time() >= expiresAt:
+            return False
+        _LOGGER.debug("Token was refreshed by another instance, reusing it")
+        self.accessToken = result["AccessToken"]
+        self.accessTokenExpiresAt = expiresAt
+        self._tokenDeadline = time.monotonic() + (expiresAt - time.time())
+        self.idToken = result["IdToken"]
+        self.idTokenType = result["TokenType"]
+        self.__updateCommandHeaders()
+        self.refreshToken = result.get("RefreshToken", self.refreshToken)
+        return True
+
     def __refreshToken(self):
         _LOGGER.debug("Refresh Token method called.")
         # Token is invalid so let's try refreshing it
-        json = {
+        body = _dumps({
             "AuthFlow": "REFRESH_TOKEN_AUTH",
             "ClientId": AWSCLIENTID,
             "AuthParameters": {
                 "REFRESH_TOKEN": self.refreshToken,
             },
-        }
-        headers = {
-            **defaultHeaders,
-            **AUTH_HEADERS,
-        }
+        })
 
-        response = requests.post(
+        response = self._session.post(
             URLS["auth"],
-            json=json,
-            headers=headers,
+            data=body,
+            headers=AUTH_HEADERS,
+            timeout=REQUEST_TIMEOUT,
         )
          
         if response.status_code == 200:
-            result = response.json()
+            result = _loads(response.content)
             self.accessToken = result["AuthenticationResult"]["AccessToken"]
-            self.accessTokenExpiresAt = (time.time() - 100) + result["AuthenticationResult"]["ExpiresIn"]
-            self.accessTokenExpiresAtDateTime = time.localtime(self.accessTokenExpiresAt)
+            self.__setTokenExpiry(result["AuthenticationResult"]["ExpiresIn"])
             self.idToken = result["AuthenticationResult"]["IdToken"]
             self.idTokenType = result["AuthenticationResult"]["TokenType"]
+            self.__updateCommandHeaders()
             if "RefreshToken" in result:
                 self.refreshToken = result["AuthenticationResult"]["RefreshToken"]
             else:
                 result["AuthenticationResult"]["RefreshToken"] = self.refreshToken
             result["expiry_time"] = self.accessTokenExpiresAt
-            result["expiry_date"] = time.localtime(self.accessTokenExpiresAt)
             self.writeToken(result)
         elif response.status_code == 400:
             _LOGGER.debug("400 response while refreshing token. Token has Expired. Re-Authorizing Now...")
@@ -163,8 +308,23 @@ class Vehicle(object):
             _LOGGER.debug("401 response while refreshing token")
             self.auth()
         else:
-            _LOGGER.debug(f"Refresh Token method did not return a 200 or 401 response. The response code returned was: {response.status_code} and the message was: {response.text}")
+            _LOGGER.debug("Refresh Token method did not return a 200 or 401 response. The response code returned was: %s and the message was: %s", response.status_code, response.text)
     
+    def __setTokenExpiry(self, expiresIn):
+        self.accessTokenExpiresIn = expiresIn
+        lifetime = expiresIn - min(TOKEN_EXPIRY_MARGIN, expiresIn * TOKEN_EXPIRY_MARGIN_FRACTION)
+        # The wall-clock expiry is saved to the token file; in-process checks use the monotonic
+        # deadline so a system clock change can't skip or force a refresh
+        self.accessTokenExpiresAt = time.time() + lifetime
+        self._tokenDeadline = time.monotonic() + lifetime
+
+    def __updateCommandHeaders(self):
+        # Rebuild the request headers only when the token changes, rather than per call
+        self._commandHeaders = {
+            **COMMAND_HEADERS,
+            "Authorization": f"{self.idTokenType} {self.idToken}",
+        }
+
     def pretty_print_request(self, request):
         """
         At this point it is completely built and ready
@@ -184,83 +344,264 @@ class Vehicle(object):
     def writeToken(self, token):
         _LOGGER.debug("Write Token method called.")
         # Save token to file to be reused
-        lock = filelock.FileLock(f"{self.token_location}.lock")
-        threadId = threading.currentThread().getName()
+        data = _dumps(token)
+        # Create the token directory on first write (or after token_location changes), not per write
+        tokenDir = os.path.dirname(self.token_location)
+        if tokenDir and tokenDir != self._tokenDir:
+            os.makedirs(tokenDir, exist_ok=True)
+            self._tokenDir = tokenDir
+        # Write to a unique temp file in the same directory, then swap it in atomically.
+        # Readers never see a partial token and concurrent writers can't collide, so no lock is needed.
+        # mkstemp also creates the file owner-only (0600), which suits a file holding credentials.
+        fd, tmpLocation = tempfile.mkstemp(
+            prefix=os.path.basename(self.token_location) + ".",
+            suffix=".tmp",
+            dir=tokenDir or ".",
+        )
         try:
-            with lock.acquire(timeout=10):
-                with open(self.token_location, "w") as outfile:
-                    _LOGGER.debug(f"Thread {threadId} has acquired lock.")
-                    json.dump(token, outfile)
-                _LOGGER.debug(f"Thread {threadId} has released lock and exited.")
-        except filelock.Timeout:
-            _LOGGER.debug(f"Another instance of this application currently holds the lock.")
+            with os.fdopen(fd, "wb") as outfile:
+                outfile.write(data)
+            os.replace(tmpLocation, self.token_location)
+        except BaseException:
+            try:
+                os.unlink(tmpLocation)
+            except FileNotFoundError:
+                pass
+            raise
 
     def readToken(self):
         _LOGGER.debug("Read Token method called.")
         # Get saved token from file
-        with open(self.token_location) as token_file:
-            return json.load(token_file)
+        with open(self.token_location, "rb") as token_file:
+            return _loads(token_file.read())
 
     def clearTempToken(self):
         _LOGGER.debug("Clear Token method called.")
-        if os.path.isfile("/tmp/droneMobile_token.txt"):
-            os.remove("/tmp/droneMobile_token.txt")
-        if os.path.isfile("/tmp/token.txt"):
-            os.remove("/tmp/token.txt")
+        for location in ("/tmp/droneMobile_token.txt", "/tmp/token.txt"):
+            try:
+                os.remove(location)
+            except FileNotFoundError:
+                pass
 
     def replaceToken(self):
         _LOGGER.debug("Replace Token method called.")
         self.clearTempToken()
-        if os.path.isfile(TOKEN_FILE_LOCATION):
+        try:
             os.remove(TOKEN_FILE_LOCATION)
+        except FileNotFoundError:
+            pass
         self.auth()
 
+    def __request(self, method, url, **kwargs):
+        # Send an authorized API request, retrying once with a fresh token if the
+        # API rejects the current one. Bounded so bad credentials can't loop forever.
+        for attempt in range(2):
+            self.__acquireToken()
+            idToken = self.idToken
+            response = self._session.request(method, url, headers=self._commandHeaders, timeout=REQUEST_TIMEOUT, **kwargs)
+            if response.status_code != 401 or attempt:
+                return response
+            _LOGGER.debug("401 response from the API. Refreshing token and retrying...")
+            self.__refreshRejectedToken(idToken)
+
+    def __refreshRejectedToken(self, idToken):
+        with self._tokenLock:
+            # When concurrent requests all get a 401, only the first refreshes; the rest
+            # find the token already replaced and retry with the new one
+            if self.idToken == idToken:
+                self.__refreshTokenLocked()
+
     def getAllVehicles(self):
         _LOGGER.debug("Get All Vehicles method called.")
-        # Get the status of the vehicles
-        self.__acquireToken()
-
-        commandHeaders = COMMAND_HEADERS
-        commandHeaders['Authorization'] = f"{self.idTokenType} {self.idToken}"
+        # Hand out a copy so callers can't change the cached list or its records
+        return copy.deepcopy(self.__vehicleList())
 
-        headers = {
-            **defaultHeaders,
-            **commandHeaders,
-        }
-
-        response = requests.get(
-            URLS["vehicle_info"],
-            headers=headers,
-        )
+    def __vehicleList(self):
+        if self._vehiclesFetchedAt is not None and time.monotonic() - self._vehiclesFetchedAt < self._vehicleCacheTTL:
+            return self._vehicleList
+        # Get the status of the vehicles
+        response = self.__request("GET", URLS["vehicle_info"])
 
         if response.status_code == 200:
-            return response.json()["results"]
+            vehicles = _loads(response.content)["results"]
+            # Index by ID once per fetch so getVehicle lookups don't rescan the list. The API's IDs
+            # are ints but callers often pass strings, so key by str() and look up the same way.
+            self._vehicles = {str(vehicle["id"]): vehicle for vehicle in vehicles}
+            self._vehicleList = vehicles
+            self._vehiclesFetchedAt = time.monotonic()
+            return vehicles
         else:
             response.raise_for_status()
 
+    def getVehicle(self, vehicleID):
+        """
+        Return a single vehicle from the account by its ID, using the cached vehicle list while it is fresh
+        """
+        self.__vehicleList()
+        vehicle = self._vehicles.get(str(vehicleID))
+        if vehicle is None:
+            raise ValueError(f"No vehicle with ID '{vehicleID}' was found on this account.")
+        return copy.deepcopy(vehicle)
+
     def vehicle_status(self, vehicleID):
         _LOGGER.debug("Vehicle Status method called.")
+        # Hand out a copy so callers can't change the cached status, or each other's
+        return copy.deepcopy(self.__status(vehicleID))
+
+    def __status(self, vehicleID):
+        # Serve back-to-back requests from the cache while the entry is fresh
+        status = self.__cachedStatus(vehicleID)
+        if status is not None:
+            return status
+        # Concurrent callers asking for the same vehicle share one request rather than each sending their own
+        with self._statusLock:
+            future = self._inflight.get(vehicleID)
+            isOwner = future is None
+            if isOwner:
+                future = Future()
+                self._inflight[vehicleID] = future
+                generation = self._statusGeneration
+        if not isOwner:
+            return future.result()
+        try:
+            status = self.__fetchStatus(vehicleID, generation)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(status)
+            return status
+        finally:
+            with self._statusLock:
+                # An invalidation may already have dropped this request and a newer one taken its place
+                if self._inflight.get(vehicleID) is future:
+                    del self._inflight[vehicleID]
+
+    def __fetchStatus(self, vehicleID, generation):
         # Get the status of the vehicles
-        self.__acquireToken()
+        response = self.__request("GET", URLS["vehicle"] + str(vehicleID))
 
-        commandHeaders = COMMAND_HEADERS
-        commandHeaders['Authorization'] = f"{self.idTokenType} {self.idToken}"
+        if response.status_code == 200:
+            status = _loads(response.content)
+            with self._statusLock:
+                # Don't cache a status requested before the cache was last invalidated
+                if generation == self._statusGeneration:
+                    self._statusCache[vehicleID] = (time.monotonic(), status)
+            return status
+        else:
+            response.raise_for_status()
 
-        headers = {
-            **defaultHeaders,
-            **commandHeaders,
-        }
+    def __cachedStatus(self, vehicleID):
+        cached = self._statusCache.get(vehicleID)
+        if cached is not None and time.monotonic() - cached[0] < self._statusCacheTTL:
+            return cached[1]
+        return None
+
+    def clearStatusCache(self):
+        """
+        Drop all cached vehicle statuses and the cached vehicle list so the next call fetches fresh data
+        """
+        with self._statusLock:
+            self._statusGeneration += 1
+            self._statusCache.clear()
+            self._inflight.clear()
+        self._vehiclesFetchedAt = None
+
+    def __invalidateStatus(self, deviceKey):
+        with self._statusLock:
+            self._statusGeneration += 1
+            # Records without a device_key can't be matched to the command, so those are dropped too
+            self._statusCache = {
+                vehicleID: cached
+                for vehicleID, cached in self._statusCache.items()
+                if isinstance(cached[1], dict) and cached[1].get("device_key", deviceKey) != deviceKey
+            }
+            # Requests already in flight may predate the command; later callers start fresh ones
+            self._inflight.clear()
+
+    def getAllVehicleStatuses(self, from_vehicle_list=False):
+        """
+        Fetch the status of every vehicle on the account, keyed by vehicle ID.
+        By default this is one request for the vehicle list (unless it is cached) plus one
+        vehicle_status request per vehicle whose status isn't cached, sent concurrently over
+        the shared session. Pass from_vehicle_list=True to use the records in the vehicle
+        list response instead, which takes at most the single list request.
+        """
+        _LOGGER.debug("Get All Vehicle Statuses method called.")
+        if from_vehicle_list:
+            return {vehicle["id"]: vehicle for vehicle in self.getAllVehicles()}
+        vehicleIDs = [vehicle["id"] for vehicle in self.__vehicleList()]
+        statuses = {}
+        staleIDs = []
+        for vehicleID in vehicleIDs:
+            status = self.__cachedStatus(vehicleID)
+            if status is None:
+                staleIDs.append(vehicleID)
+            else:
+                statuses[vehicleID] = copy.deepcopy(status)
+        statuses.update(zip(staleIDs, self.vehicle_status_many(staleIDs)))
+        return {vehicleID: statuses[vehicleID] for vehicleID in vehicleIDs}
 
-        response = requests.get(
-            f"{BASE_API_URL}{API_VERSION}/vehicle/{vehicleID}",
-            headers=headers,
+    def vehicle_status_many(self, vehicleIDs):
+        """
+        Fetch the status of several vehicles concurrently over the shared session.
+        Returns the statuses in the same order as vehicleIDs.
+        """
+        vehicleIDs = list(vehicleIDs)
+        if not vehicleIDs:
+            return []
+        # Make sure the token is fresh once up front instead of having every worker contend for the refresh
+        self.__acquireToken()
+        with ThreadPoolExecutor(max_workers=min(POOL_MAXSIZE, len(vehicleIDs))) as executor:
+            return list(executor.map(self.vehicle_status, vehicleIDs))
+
+    def startKeepAlive(self, interval=KEEPALIVE_INTERVAL):
+        """
+        Send a lightweight HEAD request every interval seconds on a background thread, so
+        NAT/firewall devices don't drop the pooled connection between infrequent polls.
+        """
+        if self._keepAliveThread is not None and self._keepAliveThread.is_alive():
+            return
+        self._keepAliveStop = threading.Event()
+        self._keepAliveThread = threading.Thread(
+            target=self.__keepAliveLoop,
+            args=(interval, self._keepAliveStop),
+            name="drone_mobile_keepalive",
+            daemon=True,
         )
+        self._keepAliveThread.start()
+
+    def stopKeepAlive(self):
+        if self._keepAliveThread is not None:
+            self._keepAliveStop.set()
+            self._keepAliveThread.join()
+            self._keepAliveThread = None
+
+    def __keepAliveLoop(self, interval, stop):
+        while not stop.wait(interval):
+            # Without a valid token the ping would only carry dead credentials and spend quota
+            if not self.__tokenIsValid():
+                _LOGGER.debug("No valid token, skipping keep-alive request.")
+                continue
+            try:
+                self._session.head(URLS["vehicle_info"], headers=self._commandHeaders, timeout=REQUEST_TIMEOUT)
+            except Exception:
+                # Never let one failed ping end the heartbeat
+                _LOGGER.debug("Keep-alive request failed.", exc_info=True)
+
+    def close(self):
+        """
+        Stop the keep-alive heartbeat and close the pooled connections
+        """
+        self.stopKeepAlive()
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            response.raise_for_status()
-    
     def device_status(self, deviceKey):
         """
         Poll the vehicle for updates
@@ -317,7 +658,7 @@ class Vehicle(object):
 
     def aux2(self, deviceKey):
         """
-        Issue a command to trigger the mapped Aux1 button event
+        Issue a command to trigger the mapped Aux2 button event
         """
         return self.sendCommand("REMOTE_AUX2", deviceKey, "1")
 
@@ -328,33 +669,67 @@ class Vehicle(object):
         return self.sendCommand("A30", deviceKey, "2")
 
     def sendCommand(self, command, deviceKey, deviceType):
-        _LOGGER.debug(f"Send Command method called to send {command} Command.")
-        self.__acquireToken()
-
-        commandHeaders = COMMAND_HEADERS
-        commandHeaders['Authorization'] = f"{self.idTokenType} {self.idToken}"
+        _LOGGER.debug("Send Command method called to send %s Command.", command)
+        if command not in AVAILABLE_COMMANDS:
+            raise ValueError(f"Invalid command '{command}'. Must be one of: {AVAILABLE_COMMANDS_STR}")
 
-        json = {
+        # Encode the body ourselves; the cached command headers already carry the JSON Content-Type
+        body = _dumps({
             "device_key": deviceKey,
             "command": command,
             "device_type":deviceType,
-        }
+        })
 
-        headers = {
-            **defaultHeaders,
-            **commandHeaders,
-        }
-
-        command = requests.post(
-            URLS["command"],
-            json=json,
-            headers=headers,
-        )
+        try:
+            response = self.__request("POST", URLS["command"], data=body)
+        finally:
+            # Every command (including status/location polls) changes what the API reports for the
+            # vehicle, and one that errored may still have reached it, so never keep its old status
+            self.__invalidateStatus(deviceKey)
 
-        if command.status_code == 200:
-            return command.json()["parsed"]
-        elif command.status_code == 424:
-            _LOGGER.error(f"""{command} Command failed. DroneMobile gave the following detail: {command.json()["parsed"]["detail"]}.""")
-            return command.json()["parsed"]
+        if response.status_code == 200:
+            return _loads(response.content)["parsed"]
+        elif response.status_code == 424:
+            try:
+                parsed = _loads(response.content)["parsed"]
+            except (ValueError, KeyError, TypeError):
+                parsed = None
+            if not isinstance(parsed, dict):
+                # Not the usual DroneMobile failure payload; surface it as an HTTP error instead
+                response.raise_for_status()
+            _LOGGER.error("%s Command failed. DroneMobile gave the following detail: %s.", command, parsed.get("detail"))
+            return parsed
         else:
-            command.raise_for_status()
+            response.raise_for_status()
+
+    def sendCommands(self, commands):
+        """
+        Send several commands over the shared session.
+        Takes an iterable of (command, deviceKey, deviceType) tuples. Commands for the same
+        deviceKey are sent one after another in the given order; different vehicles are
+        handled concurrently. Returns one entry per command, in the same order: the command's
+        result, or the exception it raised, so one failure doesn't lose the other results.
+        """
+        commands = list(commands)
+        # Validate everything up front so a bad entry doesn't leave the batch half sent
+        for command, deviceKey, deviceType in commands:
+            if command not in AVAILABLE_COMMANDS:
+                raise ValueError(f"Invalid command '{command}'. Must be one of: {AVAILABLE_COMMANDS_STR}")
+        if not commands:
+            return []
+        byDevice = {}
+        for index, (command, deviceKey, deviceType) in enumerate(commands):
+            byDevice.setdefault(deviceKey, []).append(index)
+        results = [None] * len(commands)
+
+        def sendInOrder(indexes):
+            for index in indexes:
+                try:
+                    results[index] = self.sendCommand(*commands[index])
+                except Exception as e:
+                    results[index] = e
+
+        self.__acquireToken()
+        with ThreadPoolExecutor(max_workers=min(POOL_MAXSIZE, len(byDevice))) as executor:
+            list(executor.map(sendInOrder, byDevice.values()))
+        return results
@@ -0,0 +1,470 @@
+"""Tests for the drone_mobile Vehicle client."""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from drone_mobile import drone_mobile
+from drone_mobile.const import URLS
+from drone_mobile.drone_mobile import Vehicle
+
+STATUS = {"id": 1, "device_key": "abc", "last_known_state": {"controller": {"engine_on": False}}}
+WAIT = 5
+
+
+def _response(status_code, payload=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload if payload is not None else {}).encode()
+    response.url = "https://api.dronemobile.com/"
+    return response
+
+
+def _token(idToken, expiryTime=None):
+    return {
+        "AuthenticationResult": {
+            "AccessToken": "access",
+            "IdToken": idToken,
+            "TokenType": "Bearer",
+            "RefreshToken": "refresh",
+        },
+        "expiry_time": expiryTime if expiryTime is not None else time.time() + 3600,
+    }
+
+
+def _vehicle(tmp_path, **kwargs):
+    vehicle = Vehicle("user@example.com", "password", **kwargs)
+    vehicle.token_location = str(tmp_path / "token.txt")
+    vehicle.writeToken(_token("old"))
+    return vehicle
+
+
+@pytest.fixture
+def vehicle(tmp_path):
+    vehicle = _vehicle(tmp_path)
+    yield vehicle
+    vehicle.close()
+
+
+@pytest.fixture
+def clock():
+    """Patch the monotonic clock so cache TTLs can be crossed without sleeping"""
+    now = [1000.0]
+    with mock.patch.object(drone_mobile.time, "monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+def _coalesce(vehicle, response):
+    """Run 8 concurrent vehicle_status calls, holding the first request until the other 7 have joined it"""
+    started = threading.Event()
+    release = threading.Event()
+    joined = threading.Semaphore(0)
+
+    class JoinTrackingFuture(Future):
+        def result(self, timeout=None):
+            joined.release()
+            return super().result(timeout)
+
+    def request(method, url, **kwargs):
+        started.set()
+        assert release.wait(WAIT)
+        return response
+
+    with mock.patch.object(vehicle._session, "request", side_effect=request) as mockRequest, \
+            mock.patch.object(drone_mobile, "Future", JoinTrackingFuture):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(vehicle.vehicle_status, 1)]
+            assert started.wait(WAIT)
+            futures += [executor.submit(vehicle.vehicle_status, 1) for _ in range(7)]
+            for _ in range(7):
+                assert joined.acquire(timeout=WAIT)
+            release.set()
+            outcomes = [(future.exception(), None if future.exception() else future.result()) for future in futures]
+    return mockRequest.call_count, outcomes
+
+
+def test_vehicle_status_coalesces_concurrent_calls(tmp_path):
+    # With caching off, only coalescing can keep the 7 joiners from sending their own request
+    vehicle = _vehicle(tmp_path, cache_ttl=0)
+    callCount, outcomes = _coalesce(vehicle, _response(200, STATUS))
+
+    assert callCount == 1
+    assert outcomes == [(None, STATUS)] * 8
+    assert vehicle._inflight == {}
+
+
+def test_vehicle_status_coalesced_error_reaches_every_caller(tmp_path):
+    vehicle = _vehicle(tmp_path, cache_ttl=0)
+    callCount, outcomes = _coalesce(vehicle, _response(500))
+
+    assert callCount == 1
+    assert all(isinstance(error, requests.HTTPError) for error, _ in outcomes)
+    assert vehicle._inflight == {}
+
+
+def _refreshResponse(idToken):
+    return _response(200, {
+        "AuthenticationResult": {
+            "AccessToken": "access",
+            "IdToken": idToken,
+            "TokenType": "Bearer",
+            "ExpiresIn": 3600,
+        },
+    })
+
+
+def test_unauthorized_refreshes_once_and_retries(vehicle):
+    def request(method, url, headers=None, **kwargs):
+        if headers["Authorization"] == "Bearer old":
+            return _response(401)
+        return _response(200, STATUS)
+
+    with mock.patch.object(vehicle._session, "request", side_effect=request) as mockRequest, \
+            mock.patch.object(vehicle._session, "post", return_value=_refreshResponse("new")) as mockPost:
+        assert vehicle.vehicle_status(1) == STATUS
+
+    assert mockPost.call_count == 1
+    assert mockRequest.call_count == 2
+    assert vehicle.readToken()["AuthenticationResult"]["IdToken"] == "new"
+
+
+def test_concurrent_unauthorized_requests_refresh_once(vehicle):
+    # Every worker gets its 401 before any of them can refresh
+    rejected = threading.Barrier(8)
+
+    def request(method, url, headers=None, **kwargs):
+        if headers["Authorization"] == "Bearer old":
+            rejected.wait(WAIT)
+            return _response(401)
+        return _response(200, {"id": int(url.rsplit("/", 1)[1])})
+
+    with mock.patch.object(vehicle._session, "request", side_effect=request), \
+            mock.patch.object(vehicle._session, "post", return_value=_refreshResponse("new")) as mockPost:
+        statuses = vehicle.vehicle_status_many(range(8))
+
+    assert mockPost.call_count == 1
+    assert statuses == [{"id": vehicleID} for vehicleID in range(8)]
+
+
+def test_unauthorized_retry_is_bounded(vehicle):
+    with mock.patch.object(vehicle._session, "request", return_value=_response(401)) as mockRequest, \
+            mock.patch.object(vehicle._session, "post", return_value=_refreshResponse("new")) as mockPost:
+        with pytest.raises(requests.HTTPError):
+            vehicle.vehicle_status(1)
+
+    assert mockRequest.call_count == 2
+    assert mockPost.call_count == 1
+
+
+def test_write_token_failure_keeps_previous_token(tmp_path, vehicle):
+    with mock.patch.object(drone_mobile.os, "replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            vehicle.writeToken(_token("broken"))
+
+    assert vehicle.readToken()["AuthenticationResult"]["IdToken"] == "old"
+    assert os.listdir(tmp_path) == ["token.txt"]
+
+
+def test_vehicle_status_is_cached_until_ttl(vehicle, clock):
+    with mock.patch.object(vehicle._session, "request", return_value=_response(200, STATUS)) as mockRequest:
+        vehicle.vehicle_status(1)
+        clock[0] += drone_mobile.STATUS_CACHE_TTL - 1
+        vehicle.vehicle_status(1)
+        assert mockRequest.call_count == 1
+        clock[0] += 1
+        vehicle.vehicle_status(1)
+
+    assert mockRequest.call_count == 2
+    assert mockRequest.call_args[0] == ("GET", URLS["vehicle"] + "1")
+
+
+def test_vehicle_status_returns_a_copy(vehicle):
+    with mock.patch.object(vehicle._session, "request", return_value=_response(200, STATUS)):
+        vehicle.vehicle_status(1)["last_known_state"] = None
+        assert vehicle.vehicle_status(1) == STATUS
+
+
+def test_get_all_vehicles_is_cached_until_ttl(vehicle, clock):
+    vehicles = _response(200, {"results": [STATUS]})
+    with mock.patch.object(vehicle._session, "request", return_value=vehicles) as mockRequest:
+        vehicle.getAllVehicles()
+        clock[0] += drone_mobile.VEHICLE_CACHE_TTL - 1
+        vehicle.getAllVehicles()
+        assert mockRequest.call_count == 1
+        clock[0] += 1
+        vehicle.getAllVehicles()
+
+    assert mockRequest.call_count == 2
+    assert mockRequest.call_args[0] == ("GET", URLS["vehicle_info"])
+
+
+def test_get_all_vehicles_returns_copies(vehicle):
+    with mock.patch.object(vehicle._session, "request", return_value=_response(200, {"results": [STATUS]})):
+        vehicle.getAllVehicles().pop()
+        vehicle.getVehicle(1)["device_key"] = "changed"
+        assert vehicle.getAllVehicles() == [STATUS]
+        assert vehicle.getVehicle(1) == STATUS
+
+
+@pytest.mark.parametrize("body", [b'{"parsed": null}', b'{"parsed": [1]}', b"not json"])
+def test_send_command_unexpected_424_raises_http_error(vehicle, body):
+    response = _response(424)
+    response._content = body
+    with mock.patch.object(vehicle._session, "request", return_value=response):
+        with pytest.raises(requests.HTTPError):
+            vehicle.start("abc")
+
+
+@pytest.mark.parametrize("statusCode", [502, 503, 504])
+def test_commands_are_not_retried_on_gateway_errors(vehicle, statusCode):
+    retries = vehicle._session.get_adapter(URLS["command"]).max_retries
+    assert retries.is_retry("GET", statusCode)
+    assert not retries.is_retry("POST", statusCode)
+    assert retries.is_retry("POST", 429)
+
+
+def test_refresh_reuses_token_saved_by_another_instance(vehicle):
+    vehicle._Vehicle__acquireToken()
+    other = Vehicle("user@example.com", "password")
+    other.token_location = vehicle.token_location
+    other.writeToken(_token("new"))
+
+    with mock.patch.object(vehicle._session, "post") as mockPost:
+        vehicle._Vehicle__refreshTokenLocked()
+
+    mockPost.assert_not_called()
+    assert vehicle.idToken == "new"
+
+
+def test_write_token_round_trips_without_leftovers(tmp_path):
+    vehicle = Vehicle("user@example.com", "password")
+    vehicle.token_location = str(tmp_path / "tokens" / "token.txt")
+    vehicle.writeToken(_token("first"))
+    vehicle.writeToken(_token("second"))
+
+    assert vehicle.readToken()["AuthenticationResult"]["IdToken"] == "second"
+    assert os.listdir(tmp_path / "tokens") == ["token.txt"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file modes are POSIX only")
+def test_write_token_is_owner_only(vehicle):
+    assert os.stat(vehicle.token_location).st_mode & 0o777 == 0o600
+
+
+OTHER_STATUS = {"id": 2, "device_key": "xyz", "last_known_state": {}}
+
+
+def _statusRequest(commandError=None):
+    def request(method, url, **kwargs):
+        if method == "POST":
+            if commandError is not None:
+                raise commandError
+            return _response(200, {"parsed": {"command_success": True}})
+        if url == URLS["vehicle_info"]:
+            return _response(200, {"results": [STATUS, OTHER_STATUS]})
+        return _response(200, STATUS if url.endswith("/1") else OTHER_STATUS)
+    return request
+
+
+def test_send_command_clears_only_that_vehicles_status(vehicle):
+    with mock.patch.object(vehicle._session, "request", side_effect=_statusRequest()) as mockRequest:
+        vehicle.getAllVehicles()
+        vehicle.vehicle_status(1)
+        vehicle.vehicle_status(2)
+        vehicle.start("abc")
+        vehicle.vehicle_status(1)
+        vehicle.vehicle_status(2)
+        vehicle.getAllVehicles()
+
+    assert [(call[0][0], call[0][1]) for call in mockRequest.call_args_list] == [
+        ("GET", URLS["vehicle_info"]),
+        ("GET", URLS["vehicle"] + "1"),
+        ("GET", URLS["vehicle"] + "2"),
+        ("POST", URLS["command"]),
+        ("GET", URLS["vehicle"] + "1"),
+    ]
+
+
+def test_failed_command_still_clears_status(vehicle):
+    with mock.patch.object(vehicle._session, "request", side_effect=_statusRequest(requests.ReadTimeout())) as mockRequest:
+        vehicle.vehicle_status(1)
+        with pytest.raises(requests.ReadTimeout):
+            vehicle.start("abc")
+        vehicle.vehicle_status(1)
+
+    assert [call[0][0] for call in mockRequest.call_args_list] == ["GET", "POST", "GET"]
+
+
+def test_status_fetched_before_a_command_is_not_cached(vehicle):
+    started = threading.Event()
+    release = threading.Event()
+    statusRequest = _statusRequest()
+    gets = []
+
+    def request(method, url, **kwargs):
+        if method == "GET":
+            gets.append(url)
+            if len(gets) == 1:
+                started.set()
+                assert release.wait(WAIT)
+        return statusRequest(method, url, **kwargs)
+
+    with mock.patch.object(vehicle._session, "request", side_effect=request):
+        fetch = threading.Thread(target=vehicle.vehicle_status, args=(1,))
+        fetch.start()
+        assert started.wait(WAIT)
+        vehicle.start("abc")
+        release.set()
+        fetch.join(WAIT)
+        vehicle.vehicle_status(1)
+
+    assert len(gets) == 2
+
+
+@pytest.mark.parametrize("retryAfter, expected", [("5", 5), ("3600", drone_mobile.RETRY_AFTER_MAX)])
+def test_retry_after_is_capped(vehicle, retryAfter, expected):
+    retries = vehicle._session.get_adapter(URLS["vehicle_info"]).max_retries
+    response = HTTPResponse(status=429, headers={"Retry-After": retryAfter})
+    assert retries.get_retry_after(response) == expected
+
+
+def test_saved_token_without_expiry_is_refreshed_once(vehicle):
+    token = _token("old")
+    del token["expiry_time"]
+    vehicle.writeToken(token)
+
+    with mock.patch.object(vehicle._session, "request", return_value=_response(200, STATUS)) as mockRequest, \
+            mock.patch.object(vehicle._session, "post", return_value=_refreshResponse("new")) as mockPost:
+        vehicle.vehicle_status(1)
+        vehicle.vehicle_status(2)
+        vehicle.vehicle_status(3)
+
+    assert mockPost.call_count == 1
+    assert {call[1]["headers"]["Authorization"] for call in mockRequest.call_args_list} == {"Bearer new"}
+    assert vehicle.readToken()["expiry_time"] > time.time()
+
+
+def test_expiry_datetime_round_trips(vehicle):
+    expiresAt = int(time.time()) + 3600
+    vehicle.accessTokenExpiresAt = expiresAt
+    vehicle.accessTokenExpiresAtDateTime = vehicle.accessTokenExpiresAtDateTime
+    assert vehicle.accessTokenExpiresAt == expiresAt
+
+    vehicle.accessTokenExpiresAtDateTime = time.gmtime(expiresAt)
+    assert vehicle.accessTokenExpiresAt == expiresAt
+
+    vehicle.accessTokenExpiresAtDateTime = None
+    assert vehicle.accessTokenExpiresAtDateTime is None
+
+
+@pytest.mark.parametrize("vehicleID", [1, "1"])
+def test_get_vehicle_accepts_int_or_str_id(vehicle, vehicleID):
+    with mock.patch.object(vehicle._session, "request", return_value=_response(200, {"results": [STATUS]})):
+        assert vehicle.getVehicle(vehicleID) == STATUS
+
+
+def test_get_vehicle_unknown_id_raises(vehicle):
+    with mock.patch.object(vehicle._session, "request", return_value=_response(200, {"results": [STATUS]})):
+        with pytest.raises(ValueError):
+            vehicle.getVehicle("999")
+
+
+def test_keep_alive_pings_and_stop_joins_the_thread(vehicle):
+    vehicle._Vehicle__acquireToken()
+    pinged = threading.Event()
+
+    def head(*args, **kwargs):
+        # The first ping fails; the loop must survive it to send the second
+        if head.calls:
+            pinged.set()
+        head.calls += 1
+        raise requests.ConnectionError()
+    head.calls = 0
+
+    with mock.patch.object(vehicle._session, "head", side_effect=head):
+        vehicle.startKeepAlive(interval=0.001)
+        thread = vehicle._keepAliveThread
+        assert pinged.wait(WAIT)
+        vehicle.stopKeepAlive()
+
+    assert not thread.is_alive()
+    assert vehicle._keepAliveThread is None
+
+
+def test_keep_alive_skips_ping_without_a_valid_token(tmp_path):
+    vehicle = Vehicle("user@example.com", "password")
+    checked = threading.Semaphore(0)
+
+    def tokenIsValid():
+        checked.release()
+        return False
+
+    with mock.patch.object(vehicle._session, "head") as mockHead, \
+            mock.patch.object(vehicle, "_Vehicle__tokenIsValid", side_effect=tokenIsValid):
+        vehicle.startKeepAlive(interval=0.001)
+        assert checked.acquire(timeout=WAIT)
+        assert checked.acquire(timeout=WAIT)
+        vehicle.close()
+
+    mockHead.assert_not_called()
+
+
+def test_send_commands_keeps_every_result(vehicle):
+    def request(method, url, data=None, **kwargs):
+        if json.loads(data)["command"] == "REMOTE_START":
+            return _response(500)
+        return _response(200, {"parsed": {"command": json.loads(data)["command"]}})
+
+    with mock.patch.object(vehicle._session, "request", side_effect=request):
+        results = vehicle.sendCommands([("ARM", "abc", "1"), ("REMOTE_START", "xyz", "1"), ("TRUNK", "abc", "1")])
+
+    assert results[0] == {"command": "ARM"}
+    assert isinstance(results[1], requests.HTTPError)
+    assert results[2] == {"command": "TRUNK"}
+
+
+def test_send_commands_runs_one_vehicle_in_order_and_vehicles_concurrently(vehicle):
+    # Both vehicles must be mid-command at once to get past the barrier, and REMOTE_START then
+    # stays in flight until the other vehicle's second command is sent
+    bothVehicles = threading.Barrier(2)
+    panicOffSent = threading.Event()
+    startInFlight = threading.Event()
+    sent = []
+    overlapped = []
+
+    def request(method, url, data=None, **kwargs):
+        body = json.loads(data)
+        sent.append((body["device_key"], body["command"]))
+        if body["command"] == "REMOTE_START":
+            startInFlight.set()
+            bothVehicles.wait(WAIT)
+            assert panicOffSent.wait(WAIT)
+            startInFlight.clear()
+        elif body["command"] == "PANIC_ON":
+            bothVehicles.wait(WAIT)
+        elif body["command"] == "PANIC_OFF":
+            panicOffSent.set()
+        elif body["command"] == "ARM":
+            overlapped.append(startInFlight.is_set())
+        return _response(200, {"parsed": body["command"]})
+
+    commands = [
+        ("REMOTE_START", "abc", "1"),
+        ("PANIC_ON", "xyz", "1"),
+        ("ARM", "abc", "1"),
+        ("PANIC_OFF", "xyz", "1"),
+    ]
+    with mock.patch.object(vehicle._session, "request", side_effect=request):
+        results = vehicle.sendCommands(commands)
+
+    assert results == ["REMOTE_START", "PANIC_ON", "ARM", "PANIC_OFF"]
+    assert overlapped == [False]
+    assert [command for deviceKey, command in sent if deviceKey == "abc"] == ["REMOTE_START", "ARM"]
+    assert [command for deviceKey, command in sent if deviceKey == "xyz"] == ["PANIC_ON", "PANIC_OFF"]
@@ -25,5 +25,6 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    install_requires=['requests','filelock']
+    install_requires=['requests','filelock'],
+    extras_require={'perf': ['orjson', 'brotli']}
 )
\ No newline at end of file